@@ -47,18 +47,55 @@ import sys
 import time
 import re
 import math
+from collections import defaultdict
+from dataclasses import dataclass
 from typing import Dict, List, Tuple, Optional, Any
 
+import numpy as np
+
+# Optional: Numba JIT for the load-time scatter-add aggregation. Everything
+# falls back to np.bincount when it is not installed.
+try:
+    import numba
+    _HAS_NUMBA = True
+except ImportError:
+    _HAS_NUMBA = False
+
+# =========================
+# Record types
+# =========================
+
+@dataclass(slots=True)
+class Movie:
+    """One loaded movie; slotted so attribute reads are offset loads, not dict probes."""
+    movie_id: int
+    name: str            # canonical name for display
+    genre_original: str  # original case for display
+    genre_norm: str
+    concept_key: str     # normalized 'title (YYYY)', cached to avoid regex reruns
+
+
+@dataclass(slots=True)
+class Stats:
+    """Aggregated rating stats for one movie."""
+    avg: float
+    count: int
+
+
+_NO_STATS = Stats(0.0, 0)  # shared default for movies without ratings
+
+
 # =========================
 # Global session datastore
 # =========================
 
-MOVIES_BY_ID: Dict[int, Dict[str, Any]] = {}
-MOVIES_BY_NAME: Dict[str, Dict[str, Any]] = {}  # canonical movie name -> movie dict
+MOVIES_BY_ID: Dict[int, Movie] = {}
+MOVIES_BY_NAME: Dict[str, Movie] = {}           # canonical movie name -> Movie
+MOVIES_BY_CASEFOLD: Dict[str, str] = {}         # casefolded movie name -> canonical movie name
 GENRES: Dict[str, set[str]] = {}                # normalized_genre -> set of movie names (canonical)
-RATINGS_BY_MOVIE: Dict[str, List[Tuple[int, float]]] = {}  # movie_name -> list of (user_id, rating)
-RATINGS_BY_USER: Dict[int, Dict[str, float]] = {}          # user_id -> {movie_name: rating}
-MOVIE_STATS: Dict[str, Dict[str, Any]] = {}     # movie_name -> {"avg": float, "count": int}
+RATINGS_BY_MOVIE: Dict[str, List[Tuple[int, float]]] = {}  # movie_name -> (user_id, rating) rows; emptied once stats exist
+_USER_RATED_IDX: Dict[int, np.ndarray] = {}                # user_id -> int32 movie indices the user rated
+MOVIE_STATS: Dict[str, Stats] = {}              # movie_name -> Stats(avg, count)
 GENRE_STATS: Dict[str, Dict[str, Any]] = {}     # normalized_genre -> {"avg_of_movie_avgs": float, "total_ratings": int}
 USER_IDS: List[int] = []
 USER_TOP_GENRE: Dict[int, Tuple[str, float, int]] = {}     # user_id -> (norm_genre, avg_for_user_in_genre, count)
@@ -66,15 +103,46 @@ USER_TOP_GENRE: Dict[int, Tuple[str, float, int]] = {}     # user_id -> (norm_ge
 # For displaying original case of genres
 GENRE_ORIGINAL_CASE: Dict[str, str] = {}        # normalized_genre -> original_case_seen_first
 
+# Struct-of-Arrays rating storage (filled by load_ratings_file, consumed by the
+# vectorized stats passes): one flat entry per accepted rating row.
+_MOVIE_INDEX: Dict[str, int] = {}               # canonical movie name -> dense movie index
+_MOVIE_NAMES: List[str] = []                    # dense movie index -> canonical movie name
+_MOVIE_NAME_LOWER: Dict[str, str] = {}          # canonical movie name -> lowercased (sort tiebreak)
+_GENRE_INDEX: Dict[str, int] = {}               # normalized_genre -> dense genre index
+_GENRE_NAMES: List[str] = []                    # dense genre index -> normalized_genre
+_USER_INDEX: Dict[int, int] = {}                # user_id -> dense user index
+_USER_IDS_DENSE: List[int] = []                 # dense user index -> user_id
+_RATING_VALUES: List[float] = []                # rating value per accepted row
+_RATING_MOVIE_IDX: List[int] = []               # dense movie index per accepted row
+_RATING_USER_IDX: List[int] = []                # dense user index per accepted row
+_STATS_SCRATCH: Dict[str, np.ndarray] = {}      # arrays shared across the compute_* passes
+
+# Sort caches (built once after stats, reused by every feature invocation)
+_MOVIE_SORT_KEY: Dict[str, Tuple[float, int, str, int]] = {}  # movie_name -> precomputed sort key
+_MOVIES_SORTED_GLOBAL: List[str] = []           # all movie names, presorted by popularity
+_MOVIES_SORTED_BY_GENRE: Dict[str, List[str]] = {}  # normalized_genre -> presorted movie names
+_GENRE_MOVIE_IDX_SORTED: Dict[str, np.ndarray] = {}  # same order as above, as dense movie indices
+_MOVIE_LINE_FULL: Dict[str, str] = {}           # movie_name -> display line with genre (feature 1)
+_MOVIE_LINE_BRIEF: Dict[str, str] = {}          # movie_name -> display line without genre (features 2/5)
+_GENRE_LINE: Dict[str, str] = {}                # normalized_genre -> display line (feature 3)
+_GENRES_DISPLAY_SORTED: List[str] = []          # genre display names, sorted A-Z (feature 2 menu)
+_GENRE_SORT_KEY: Dict[str, Tuple[float, int, str]] = {}  # normalized_genre -> precomputed sort key
+_GENRE_TIEBREAK: Dict[str, str] = {}            # normalized_genre -> display name lowercased
+
 
 # =========================
 # Utility / Helpers
 # =========================
 
-def _spinner_one_line(action_text: str, cycles: int = 10, delay: float = 0.06) -> None:
+def _spinner_one_line(action_text: str, cycles: int = 3, delay: float = 0.06) -> None:
     """
     Show a short one-line spinner animation to indicate loading.
+    Skipped entirely (no sleeps) when stdout is not a TTY — piped/automated
+    runs — or when MOVIE_REC_NO_ANIM is set.
     """
+    if not sys.stdout.isatty() or os.environ.get("MOVIE_REC_NO_ANIM"):
+        print(action_text, flush=True)
+        return
     seq = "|/-\\"
     print(action_text, end="", flush=True)
     for i in range(cycles):
@@ -83,62 +151,142 @@ def _spinner_one_line(action_text: str, cycles: int = 10, delay: float = 0.06) -
     print("\r" + " " * (len(action_text) + 2), end="\r", flush=True)
 
 
+_INT_RE = re.compile(r'^[+-]?\d+\.?$')  # menu numbers, optional trailing period
+
+
 def _strip_int_like(s: str) -> Optional[int]:
     """
     Accept numeric inputs like "1" or "1." and return int(1). Returns None if not valid.
     """
     s = s.strip()
-    if s.endswith("."):
-        s = s[:-1]
-    if s.isdigit() or (s and s[0] in "+-" and s[1:].isdigit()):
-        try:
-            return int(s)
-        except ValueError:
-            return None
+    if _INT_RE.match(s):
+        return int(s[:-1] if s.endswith(".") else s)
     return None
 
 
+_SINGLE_KEY = {"q": "quit", "Q": "quit", "b": "back", "B": "back"}
+_BACK = object()  # sentinel returned by _read_choice for 'b'
+
+
+def _read_choice(prompt: str, allow_back: bool = True) -> Any:
+    """
+    Read one line of menu input with the global single-key commands handled in
+    one place: 'q' quits the program, 'b' returns the _BACK sentinel (when
+    allowed). Anything else parses once via _strip_int_like — an int on
+    success, None when invalid.
+    """
+    s = input(prompt).strip()
+    cmd = _SINGLE_KEY.get(s)
+    if cmd == "quit":
+        sys.exit(0)
+    if cmd == "back" and allow_back:
+        return _BACK
+    return _strip_int_like(s)
+
+
 def _fmt_avg(x: float) -> str:
     """Format averages to two decimals."""
     return f"{x:.2f}"
 
 
 def _norm_genre(g: str) -> str:
-    """Normalize genre for internal keys (case-insensitive)."""
-    return g.strip().lower()
-
-
-def _case_insensitive_equal_same_length(a: str, b: str) -> bool:
-    """
-    Return True if strings are the same except for case; requires same length.
-    (Year is part of the movie name and must match under this equality.)
-    """
-    return len(a) == len(b) and a.lower() == b.lower()
+    """Normalize genre for internal keys (case-insensitive). Interned so every
+    structure keyed by the normalized genre shares one string object."""
+    return sys.intern(g.strip().lower())
 
 
 def _get_canonical_movie_name(new_name: str) -> str:
     """
     If a movie already exists in MOVIES_BY_NAME that matches new_name by case-insensitive-same-length rule,
     return the existing canonical key; otherwise, return new_name to become canonical.
+    Uses the MOVIES_BY_CASEFOLD index for an O(1) lookup instead of scanning all movie names.
     """
-    for existing in MOVIES_BY_NAME.keys():
-        if _case_insensitive_equal_same_length(existing, new_name):
-            return existing
-    return new_name
+    existing = MOVIES_BY_CASEFOLD.get(new_name.casefold())
+    if existing is not None and len(existing) == len(new_name):
+        return existing
+    # Intern new canonicals: the same name is a key in several dicts, so sharing
+    # one string object lets later lookups short-circuit on identity.
+    return sys.intern(new_name)
 
 
 def _clear_globals() -> None:
-    """Clear all global data structures."""
-    MOVIES_BY_ID.clear()
-    MOVIES_BY_NAME.clear()
-    GENRES.clear()
+    """
+    Reset all global data structures. Rebinds fresh containers instead of
+    .clear()-ing the old ones — O(1) per container, with the old (possibly
+    large) tables reclaimed lazily by refcounting rather than walked inline.
+    """
+    global MOVIES_BY_ID, MOVIES_BY_NAME, MOVIES_BY_CASEFOLD, GENRES
+    global RATINGS_BY_MOVIE, _USER_RATED_IDX, MOVIE_STATS, GENRE_STATS
+    global USER_IDS, USER_TOP_GENRE, GENRE_ORIGINAL_CASE
+    global _MOVIE_INDEX, _MOVIE_NAMES, _MOVIE_NAME_LOWER
+    global _GENRE_INDEX, _GENRE_NAMES, _USER_INDEX, _USER_IDS_DENSE
+    global _RATING_VALUES, _RATING_MOVIE_IDX, _RATING_USER_IDX, _STATS_SCRATCH
+    global _MOVIE_SORT_KEY, _MOVIES_SORTED_GLOBAL, _MOVIES_SORTED_BY_GENRE
+    global _GENRE_MOVIE_IDX_SORTED, _MOVIE_LINE_FULL, _MOVIE_LINE_BRIEF
+    global _GENRE_LINE, _GENRES_DISPLAY_SORTED, _GENRE_SORT_KEY, _GENRE_TIEBREAK
+    MOVIES_BY_ID = {}
+    MOVIES_BY_NAME = {}
+    MOVIES_BY_CASEFOLD = {}
+    GENRES = {}
+    RATINGS_BY_MOVIE = {}
+    _USER_RATED_IDX = {}
+    MOVIE_STATS = {}
+    GENRE_STATS = {}
+    USER_IDS = []
+    USER_TOP_GENRE = {}
+    GENRE_ORIGINAL_CASE = {}
+    _MOVIE_INDEX = {}
+    _MOVIE_NAMES = []
+    _MOVIE_NAME_LOWER = {}
+    _GENRE_INDEX = {}
+    _GENRE_NAMES = []
+    _USER_INDEX = {}
+    _USER_IDS_DENSE = []
+    _RATING_VALUES = []
+    _RATING_MOVIE_IDX = []
+    _RATING_USER_IDX = []
+    _STATS_SCRATCH = {}
+    _MOVIE_SORT_KEY = {}
+    _MOVIES_SORTED_GLOBAL = []
+    _MOVIES_SORTED_BY_GENRE = {}
+    _GENRE_MOVIE_IDX_SORTED = {}
+    _MOVIE_LINE_FULL = {}
+    _MOVIE_LINE_BRIEF = {}
+    _GENRE_LINE = {}
+    _GENRES_DISPLAY_SORTED = []
+    _GENRE_SORT_KEY = {}
+    _GENRE_TIEBREAK = {}
+
+
+def _clear_ratings_state() -> None:
+    """
+    Drop everything derived from a ratings load (loaded movies stay intact).
+    Called when a ratings file fails so the re-prompt starts from a clean
+    'movies loaded, no ratings' state — the single place to extend when a new
+    ratings-derived global or cache is added.
+    """
     RATINGS_BY_MOVIE.clear()
-    RATINGS_BY_USER.clear()
+    _USER_RATED_IDX.clear()
     MOVIE_STATS.clear()
     GENRE_STATS.clear()
     USER_IDS.clear()
     USER_TOP_GENRE.clear()
-    GENRE_ORIGINAL_CASE.clear()
+    _USER_INDEX.clear()
+    _USER_IDS_DENSE.clear()
+    _RATING_VALUES.clear()
+    _RATING_MOVIE_IDX.clear()
+    _RATING_USER_IDX.clear()
+    _STATS_SCRATCH.clear()
+    _MOVIE_SORT_KEY.clear()
+    _MOVIES_SORTED_GLOBAL.clear()
+    _MOVIES_SORTED_BY_GENRE.clear()
+    _GENRE_MOVIE_IDX_SORTED.clear()
+    _MOVIE_LINE_FULL.clear()
+    _MOVIE_LINE_BRIEF.clear()
+    _GENRE_LINE.clear()
+    _GENRES_DISPLAY_SORTED.clear()
+    _GENRE_SORT_KEY.clear()
+    _GENRE_TIEBREAK.clear()
 
 
 # =========================
@@ -150,20 +298,23 @@ class LoadError(Exception):
     pass
 
 
+# One compiled match per row instead of split + per-field strip/emptiness checks.
+# Each field is exactly 3 pipe-separated columns captured pre-stripped and non-empty.
+_FIELD = r'([^|\s](?:[^|]*[^|\s])?)'
+_MOVIES_RE = re.compile(rf'^\s*{_FIELD}\s*\|\s*{_FIELD}\s*\|\s*{_FIELD}\s*$')
+_RATINGS_RE = _MOVIES_RE  # same 3-column shape: movie_name|rating|user_id
+
+
 def _parse_movies_line(line: str, line_no: int) -> Tuple[str, int, str]:
     """
     Parse a movies line: genre|movie_id|movie_name
     Returns (genre_original_case, movie_id, movie_name_display)
     Raises LoadError for malformed rows.
     """
-    parts = line.rstrip("\n").split("|")
-    if len(parts) != 3:
-        raise LoadError(f"Movies file malformed at line {line_no}: expected 3 fields (genre|movie_id|movie_name).")
-    genre, movie_id_s, movie_name = parts
-    genre = genre.strip()
-    movie_name = movie_name.strip()
-    if not genre or not movie_id_s.strip() or not movie_name:
-        raise LoadError(f"Movies file malformed at line {line_no}: empty field(s).")
+    m = _MOVIES_RE.match(line)
+    if not m:
+        raise LoadError(f"Movies file malformed at line {line_no}: expected 3 non-empty fields (genre|movie_id|movie_name).")
+    genre, movie_id_s, movie_name = m.groups()
     try:
         movie_id = int(movie_id_s)
     except ValueError:
@@ -172,18 +323,19 @@ def _parse_movies_line(line: str, line_no: int) -> Tuple[str, int, str]:
 
 
 # --- Concept-level (title + year) validation helpers for MOVIES ---
-_YEAR_RE = re.compile(r'^(?P<title>.+?)\s*\(\s*(?P<year>\d{4})\s*\)\s*$')
 
 def _extract_title_year(movie_name: str, line_no: int) -> tuple[str, int]:
     """
-    Enforce 'Title (YYYY)' with a 4-digit year. Title is normalized by collapsing inner whitespace.
+    Enforce 'Title (YYYY)' with a 4-digit year — the year sits in a strict
+    '(dddd)' suffix. Title is normalized by collapsing inner whitespace.
+    Hand-rolled slice checks instead of the backtracking regex engine.
     """
-    m = _YEAR_RE.match(movie_name)
-    if not m:
-        raise LoadError(f"Movies file malformed at line {line_no}: movie_name must end with (YYYY).")
-    title = " ".join(m.group("title").split())  # collapse multiple spaces into single
-    year = int(m.group("year"))
-    return title, year
+    s = movie_name.rstrip()
+    if len(s) >= 7 and s.endswith(")") and s[-6] == "(" and s[-5:-1].isdecimal():
+        title = " ".join(s[:-6].split())  # collapse multiple spaces into single
+        if title:
+            return title, int(s[-5:-1])
+    raise LoadError(f"Movies file malformed at line {line_no}: movie_name must end with (YYYY).")
 
 def _concept_key(movie_name: str, line_no: int) -> str:
     """
@@ -200,12 +352,10 @@ def _parse_ratings_line(line: str, line_no: int) -> Tuple[str, float, int]:
     Raises LoadError for malformed rows or non-numeric/non-finite rating or non-integer user_id.
     (Out-of-range rating and unknown movie handling are done in the loader and do not abort.)
     """
-    parts = line.rstrip("\n").split("|")
-    if len(parts) != 3:
-        raise LoadError(f"Ratings file malformed at line {line_no}: expected 3 fields (movie_name|rating|user_id).")
-    movie_name, rating_s, user_id_s = (p.strip() for p in parts)
-    if not movie_name or not rating_s or not user_id_s:
-        raise LoadError(f"Ratings file malformed at line {line_no}: empty field(s).")
+    m = _RATINGS_RE.match(line)
+    if not m:
+        raise LoadError(f"Ratings file malformed at line {line_no}: expected 3 non-empty fields (movie_name|rating|user_id).")
+    movie_name, rating_s, user_id_s = m.groups()
     try:
         rating = float(rating_s)
     except ValueError:
@@ -219,11 +369,26 @@ def _parse_ratings_line(line: str, line_no: int) -> Tuple[str, float, int]:
     return movie_name, rating, user_id
 
 
+def _iter_data_lines(path: str):
+    """
+    Stream non-blank lines from a data file as (line_no, line) pairs without
+    materializing the whole file in memory. BOM tolerant. Line numbers count
+    non-blank lines, matching the error messages of the batched loader.
+    """
+    with open(path, "r", encoding="utf-8-sig", buffering=1 << 20) as f:
+        line_no = 0
+        for raw in f:
+            if raw.strip():
+                line_no += 1
+                yield line_no, raw
+
+
 def load_movies_file(path: str) -> None:
     """
     Load and validate the movies file. Populates:
       - MOVIES_BY_ID
       - MOVIES_BY_NAME
+      - MOVIES_BY_CASEFOLD
       - GENRES
       - GENRE_ORIGINAL_CASE
     Raises LoadError on any validation failure (abort load).
@@ -231,17 +396,12 @@ def load_movies_file(path: str) -> None:
     if not os.path.isfile(path):
         raise LoadError("Movies file does not exist.")
 
-    # BOM tolerant
-    with open(path, "r", encoding="utf-8-sig") as f:
-        lines = [ln for ln in (l.strip("\n") for l in f) if ln.strip()]
-
-    if not lines:
-        raise LoadError("Movies file is empty.")
-
     # Track conceptual duplicates and id conflicts
     concept_to_id: Dict[str, int] = {}
 
-    for i, raw in enumerate(lines, start=1):
+    had_rows = False
+    for i, raw in _iter_data_lines(path):
+        had_rows = True
         genre_original, movie_id, movie_name_raw = _parse_movies_line(raw, i)
 
         # negative id → abort
@@ -261,28 +421,32 @@ def load_movies_file(path: str) -> None:
 
         # duplicate ID used for a different concept → abort
         if movie_id in MOVIES_BY_ID:
-            existing_ck = _concept_key(MOVIES_BY_ID[movie_id]["name"], i)
-            if existing_ck != ck:
+            if MOVIES_BY_ID[movie_id].concept_key != ck:
                 raise LoadError(
                     f"Movies file malformed at line {i}: movie_id {movie_id} reused for a different movie."
                 )
 
         # Merge / canonicalize display name by case-insensitive same-length equivalence
         canonical_name = _get_canonical_movie_name(movie_name_raw)
+        MOVIES_BY_CASEFOLD.setdefault(canonical_name.casefold(), canonical_name)
 
         if canonical_name not in MOVIES_BY_NAME:
             # Insert movie record
-            MOVIES_BY_NAME[canonical_name] = {
-                "movie_id": movie_id,
-                "name": canonical_name,                 # canonical name for display
-                "genre_original": genre_original,       # original case for display
-                "genre_norm": _norm_genre(genre_original),
-            }
+            MOVIES_BY_NAME[canonical_name] = Movie(
+                movie_id=movie_id,
+                name=canonical_name,
+                genre_original=genre_original,
+                genre_norm=_norm_genre(genre_original),
+                concept_key=ck,
+            )
             MOVIES_BY_ID[movie_id] = MOVIES_BY_NAME[canonical_name]
+            _MOVIE_INDEX[canonical_name] = len(_MOVIE_NAMES)
+            _MOVIE_NAMES.append(canonical_name)
+            _MOVIE_NAME_LOWER[canonical_name] = canonical_name.lower()
         else:
             # If same display-name canonical but different ID → abort
             existing = MOVIES_BY_NAME[canonical_name]
-            if existing["movie_id"] != movie_id:
+            if existing.movie_id != movie_id:
                 raise LoadError(
                     f"Movies file malformed at line {i}: same movie name (case-insensitive) with different IDs."
                 )
@@ -292,13 +456,19 @@ def load_movies_file(path: str) -> None:
         norm_g = _norm_genre(genre_original)
         GENRES.setdefault(norm_g, set()).add(canonical_name)
         GENRE_ORIGINAL_CASE.setdefault(norm_g, genre_original)
+        if norm_g not in _GENRE_INDEX:
+            _GENRE_INDEX[norm_g] = len(_GENRE_NAMES)
+            _GENRE_NAMES.append(norm_g)
+
+    if not had_rows:
+        raise LoadError("Movies file is empty.")
 
 
 def load_ratings_file(path: str) -> None:
     """
     Load and validate the ratings file. Populates:
       - RATINGS_BY_MOVIE
-      - RATINGS_BY_USER
+      - _USER_RATED_IDX
       - USER_IDS
       - (observes duplicate rating policy: keep first)
     Aborts on file-level validation failures; skips per-row issues as per rules.
@@ -306,16 +476,12 @@ def load_ratings_file(path: str) -> None:
     if not os.path.isfile(path):
         raise LoadError("Ratings file does not exist.")
 
-    # BOM tolerant
-    with open(path, "r", encoding="utf-8-sig") as f:
-        lines = [ln for ln in (l.strip("\n") for l in f) if ln.strip()]
+    seen_user_movie: set[int] = set()  # (user_id << 32) | movie_idx
+    rated_idx: Dict[int, List[int]] = defaultdict(list)
 
-    if not lines:
-        raise LoadError("Ratings file is empty.")
-
-    seen_user_movie: set[Tuple[int, str]] = set()
-
-    for i, raw in enumerate(lines, start=1):
+    had_rows = False
+    for i, raw in _iter_data_lines(path):
+        had_rows = True
         movie_name_raw, rating, user_id = _parse_ratings_line(raw, i)
 
         # negative user id → abort whole file
@@ -326,41 +492,71 @@ def load_ratings_file(path: str) -> None:
         if not (0.0 <= rating <= 5.0):
             continue
 
-        # map to canonical movie (case-insensitive, same-length rule)
-        canonical_name = None
-        for existing in MOVIES_BY_NAME.keys():
-            if _case_insensitive_equal_same_length(existing, movie_name_raw):
-                canonical_name = existing
-                break
+        # map to canonical movie (case-insensitive, same-length rule) via the casefold index
+        canonical_name = MOVIES_BY_CASEFOLD.get(movie_name_raw.casefold())
+        if canonical_name is not None and len(canonical_name) != len(movie_name_raw):
+            canonical_name = None
 
         # unknown movie → skip row (do NOT abort)
         if canonical_name is None:
             continue
 
-        key = (user_id, canonical_name)
+        # pack (user_id, movie) into one int — movie indices fit comfortably
+        # in 32 bits, and int keys hash faster than tuples holding a string
+        midx = _MOVIE_INDEX[canonical_name]
+        key = (user_id << 32) | midx
         if key in seen_user_movie:
             # duplicate rating for same user+movie -> ignore (keep first)
             continue
         seen_user_movie.add(key)
 
         RATINGS_BY_MOVIE.setdefault(canonical_name, []).append((user_id, rating))
-        RATINGS_BY_USER.setdefault(user_id, {})[canonical_name] = rating
+        rated_idx[user_id].append(midx)
+        uidx = _USER_INDEX.get(user_id)
+        if uidx is None:
+            uidx = _USER_INDEX[user_id] = len(_USER_IDS_DENSE)
+            _USER_IDS_DENSE.append(user_id)
+        _RATING_VALUES.append(rating)
+        _RATING_MOVIE_IDX.append(midx)
+        _RATING_USER_IDX.append(uidx)
+
+    if not had_rows:
+        raise LoadError("Ratings file is empty.")
+
+    # One contiguous int32 array per user (integer indices hash and compare
+    # faster than the movie-name strings they replace)
+    for uid, idxs in rated_idx.items():
+        _USER_RATED_IDX[uid] = np.asarray(idxs, dtype=np.int32)
 
     # USER_IDS sorted
-    USER_IDS[:] = sorted(RATINGS_BY_USER.keys())
+    USER_IDS[:] = sorted(_USER_INDEX.keys())
 
 
 def compute_movie_stats() -> None:
     """
-    Compute MOVIE_STATS from RATINGS_BY_MOVIE.
+    Compute MOVIE_STATS from the flat rating arrays with vectorized bincounts
+    (one C-level pass instead of per-movie Python summation).
     """
     MOVIE_STATS.clear()
-    for movie_name, rating_list in RATINGS_BY_MOVIE.items():
-        if not rating_list:
-            continue
-        total = sum(r for _, r in rating_list)
-        cnt = len(rating_list)
-        MOVIE_STATS[movie_name] = {"avg": (total / cnt), "count": cnt}
+    _STATS_SCRATCH.clear()
+    if not _RATING_VALUES:
+        return
+    mi = np.asarray(_RATING_MOVIE_IDX, dtype=np.intp)
+    rv = np.asarray(_RATING_VALUES, dtype=np.float64)
+    sums = np.bincount(mi, weights=rv, minlength=len(_MOVIE_NAMES))
+    cnts = np.bincount(mi, minlength=len(_MOVIE_NAMES))
+    # Stash the row arrays and per-movie aggregates so the genre and top-genre
+    # passes reuse them instead of re-materializing from the Python lists.
+    _STATS_SCRATCH.update(mi=mi, rv=rv, movie_sums=sums, movie_cnts=cnts)
+    for idx in np.nonzero(cnts)[0]:
+        cnt = int(cnts[idx])
+        MOVIE_STATS[_MOVIE_NAMES[idx]] = Stats(avg=sums[idx] / cnt, count=cnt)
+
+    # The per-row (user_id, rating) tuples are only needed up to this point —
+    # everything downstream reads MOVIE_STATS or the flat arrays. Release the
+    # tuple lists, keeping the keys as the record of which movies were rated.
+    for name in RATINGS_BY_MOVIE:
+        RATINGS_BY_MOVIE[name] = []
 
 
 def compute_genre_stats() -> None:
@@ -369,19 +565,94 @@ def compute_genre_stats() -> None:
     Also compute total ratings per genre (sum of movie counts).
     """
     GENRE_STATS.clear()
-    for norm_g, movie_names in GENRES.items():
-        avgs: List[float] = []
-        total_count = 0
-        for m in movie_names:
-            st = MOVIE_STATS.get(m)
-            if st and st["count"] > 0:
-                avgs.append(st["avg"])
-                total_count += st["count"]
-        if avgs:
-            GENRE_STATS[norm_g] = {
-                "avg_of_movie_avgs": sum(avgs) / len(avgs),
-                "total_ratings": total_count,
+    cnts = _STATS_SCRATCH.get("movie_cnts")
+    if cnts is not None and _GENRE_NAMES:
+        sums = _STATS_SCRATCH["movie_sums"]
+        # Aggregate over GENRES membership, not one genre per movie: the
+        # loader accepts the same movie listed under several genres, and it
+        # must contribute to each of them (genre_norm holds only the first).
+        pair_g: List[int] = []
+        pair_m: List[int] = []
+        for norm_g, movie_names in GENRES.items():
+            gi = _GENRE_INDEX[norm_g]
+            for m in movie_names:
+                pair_g.append(gi)
+                pair_m.append(_MOVIE_INDEX[m])
+        pg = np.asarray(pair_g, dtype=np.intp)
+        pm = np.asarray(pair_m, dtype=np.intp)
+        rated = cnts[pm] > 0
+        pg = pg[rated]
+        pm = pm[rated]
+        mavg = sums[pm] / cnts[pm]
+        num_genres = len(_GENRE_NAMES)
+        avg_sums = np.bincount(pg, weights=mavg, minlength=num_genres)
+        n_rated = np.bincount(pg, minlength=num_genres)
+        totals = np.bincount(pg, weights=cnts[pm], minlength=num_genres)
+        for gi in np.nonzero(n_rated)[0]:
+            GENRE_STATS[_GENRE_NAMES[gi]] = {
+                "avg_of_movie_avgs": float(avg_sums[gi]) / int(n_rated[gi]),
+                "total_ratings": int(totals[gi]),
             }
+    _build_sort_caches()
+
+
+def _build_sort_caches() -> None:
+    """
+    Precompute movie sort keys and presorted movie lists (global and per genre)
+    so feature handlers reuse them instead of re-sorting on every invocation.
+    """
+    _MOVIE_SORT_KEY.clear()
+    _MOVIES_SORTED_GLOBAL.clear()
+    _MOVIES_SORTED_BY_GENRE.clear()
+    _GENRE_MOVIE_IDX_SORTED.clear()
+    _MOVIE_LINE_FULL.clear()
+    _MOVIE_LINE_BRIEF.clear()
+    _GENRE_LINE.clear()
+    _GENRES_DISPLAY_SORTED.clear()
+    _GENRE_SORT_KEY.clear()
+    _GENRE_TIEBREAK.clear()
+    for name, movie in MOVIES_BY_NAME.items():
+        st = MOVIE_STATS.get(name)
+        name_lower = _MOVIE_NAME_LOWER.get(name) or name.lower()
+        if st:
+            _MOVIE_SORT_KEY[name] = (-st.avg, -st.count, name_lower, movie.movie_id)
+        else:
+            _MOVIE_SORT_KEY[name] = (0.0, 0, name_lower, movie.movie_id)
+    _MOVIES_SORTED_GLOBAL.extend(sorted(MOVIES_BY_NAME, key=_MOVIE_SORT_KEY.__getitem__))
+    for norm_g, movie_names in GENRES.items():
+        ordered = sorted(movie_names, key=_MOVIE_SORT_KEY.__getitem__)
+        _MOVIES_SORTED_BY_GENRE[norm_g] = ordered
+        _GENRE_MOVIE_IDX_SORTED[norm_g] = np.fromiter(
+            (_MOVIE_INDEX[m] for m in ordered), dtype=np.int32, count=len(ordered)
+        )
+
+    # Display lines are immutable between loads; format them once here instead
+    # of per feature invocation.
+    for name, movie in MOVIES_BY_NAME.items():
+        st = MOVIE_STATS.get(name, _NO_STATS)
+        brief = f"{movie.name} — Avg: {_fmt_avg(st.avg)} (Count: {st.count})"
+        _MOVIE_LINE_BRIEF[name] = brief
+        _MOVIE_LINE_FULL[name] = f"{brief} — Genre: {movie.genre_original}"
+    for norm_g in GENRES:
+        _GENRE_TIEBREAK[norm_g] = GENRE_ORIGINAL_CASE.get(norm_g, norm_g).lower()
+    for norm_g, gst in GENRE_STATS.items():
+        disp = GENRE_ORIGINAL_CASE.get(norm_g, norm_g)
+        _GENRE_LINE[norm_g] = (f"{disp} — Avg of avgs: {_fmt_avg(gst['avg_of_movie_avgs'])} "
+                               f"(Total ratings: {gst['total_ratings']})")
+        _GENRE_SORT_KEY[norm_g] = (-gst["avg_of_movie_avgs"], -gst["total_ratings"],
+                                   _GENRE_TIEBREAK[norm_g])
+    _GENRES_DISPLAY_SORTED.extend(
+        sorted({GENRE_ORIGINAL_CASE.get(g, g) for g in GENRES}, key=str.lower))
+
+
+if _HAS_NUMBA:
+    @numba.njit(cache=True)
+    def _scatter_add(keys, values, sums, cnts):  # pragma: no cover - needs numba
+        """Accumulate values/counts into flat cells addressed by keys."""
+        for i in range(keys.shape[0]):
+            k = keys[i]
+            sums[k] += values[i]
+            cnts[k] += 1
 
 
 def compute_user_top_genre_cache() -> None:
@@ -392,28 +663,59 @@ def compute_user_top_genre_cache() -> None:
       - genre name A-Z
     """
     USER_TOP_GENRE.clear()
-    for uid, rated_map in RATINGS_BY_USER.items():
-        # genre -> (sum, count)
-        agg: Dict[str, Tuple[float, int]] = {}
-        for movie_name, r in rated_map.items():
-            movie = MOVIES_BY_NAME.get(movie_name)
-            if not movie:
-                continue
-            gn = movie["genre_norm"]
-            s, c = agg.get(gn, (0.0, 0))
-            agg[gn] = (s + r, c + 1)
-
-        if not agg:
-            continue
+    if not _RATING_VALUES or not _GENRE_NAMES:
+        return
 
-        # pick best by avg desc, then count desc, then genre name A-Z
-        best = sorted(
-            ((gn, s / c, c) for gn, (s, c) in agg.items() if c >= 1),
-            key=lambda tup: (-tup[1], -tup[2], GENRE_ORIGINAL_CASE.get(tup[0], tup[0]).lower()),
-        )
-        if best:
-            top = best[0]  # (gn, avg, count)
-            USER_TOP_GENRE[uid] = (top[0], top[1], top[2])
+    num_users = len(_USER_IDS_DENSE)
+    num_genres = len(_GENRE_NAMES)
+
+    # Genre index per movie (the movie's first/primary genre), gathered to one
+    # genre index per rating row. Deliberately NOT the per-genre membership
+    # pairs compute_genre_stats aggregates over — a user's rating counts once,
+    # toward the movie's primary genre. Row arrays are reused from the scratch.
+    movie_gidx = np.fromiter(
+        (_GENRE_INDEX[MOVIES_BY_NAME[m].genre_norm] for m in _MOVIE_NAMES),
+        dtype=np.intp,
+        count=len(_MOVIE_NAMES),
+    )
+    mi = _STATS_SCRATCH.get("mi")
+    if mi is None:
+        mi = np.asarray(_RATING_MOVIE_IDX, dtype=np.intp)
+    rv = _STATS_SCRATCH.get("rv")
+    if rv is None:
+        rv = np.asarray(_RATING_VALUES, dtype=np.float64)
+    uidx = np.asarray(_RATING_USER_IDX, dtype=np.intp)
+    gidx = movie_gidx[mi]
+
+    # Per-(user, genre) sums/counts on a composite key: one JIT-compiled
+    # scatter-add pass when Numba is available, np.bincount otherwise.
+    key = uidx * num_genres + gidx
+    total = num_users * num_genres
+    if _HAS_NUMBA:
+        sums = np.zeros(total)
+        cnts = np.zeros(total, dtype=np.int64)
+        _scatter_add(key, rv, sums, cnts)
+        sums = sums.reshape(num_users, num_genres)
+        cnts = cnts.reshape(num_users, num_genres)
+    else:
+        sums = np.bincount(key, weights=rv, minlength=total).reshape(num_users, num_genres)
+        cnts = np.bincount(key, minlength=total).reshape(num_users, num_genres)
+    avgs = np.where(cnts > 0, sums / np.maximum(cnts, 1), -1.0)
+
+    # Tie-break rank: genre display name A-Z (matches the old sort key).
+    rank = np.empty(num_genres, dtype=np.intp)
+    alpha = sorted(range(num_genres),
+                   key=lambda gi: _GENRE_TIEBREAK.get(_GENRE_NAMES[gi], _GENRE_NAMES[gi]))
+    for pos, gi in enumerate(alpha):
+        rank[gi] = pos
+
+    # Row-wise best genre: avg desc, then count desc, then rank asc.
+    order = np.lexsort((np.broadcast_to(rank, (num_users, num_genres)), -cnts, -avgs))
+    best = order[:, 0]
+    for u, gi in enumerate(best):
+        cnt = int(cnts[u, gi])
+        if cnt > 0:
+            USER_TOP_GENRE[_USER_IDS_DENSE[u]] = (_GENRE_NAMES[gi], float(avgs[u, gi]), cnt)
 
 
 def load_all_with_prompt() -> None:
@@ -456,22 +758,11 @@ def load_all_with_prompt() -> None:
                 return
             except LoadError as e:
                 print(f"[Error] {e}")
-                # Reset ratings-dependent structures before re-prompting ratings file
-                RATINGS_BY_MOVIE.clear()
-                RATINGS_BY_USER.clear()
-                MOVIE_STATS.clear()
-                GENRE_STATS.clear()
-                USER_IDS.clear()
-                USER_TOP_GENRE.clear()
+                _clear_ratings_state()
                 continue
             except Exception as e:
                 print(f"[Error] Unexpected error while loading ratings: {e}")
-                RATINGS_BY_MOVIE.clear()
-                RATINGS_BY_USER.clear()
-                MOVIE_STATS.clear()
-                GENRE_STATS.clear()
-                USER_IDS.clear()
-                USER_TOP_GENRE.clear()
+                _clear_ratings_state()
                 continue
 
 
@@ -486,11 +777,9 @@ def _movie_sort_key(movie_name: str) -> Tuple[float, int, str, int]:
       2) rating count desc
       3) movie name A-Z
       4) movie_id asc
+    Keys are precomputed in _build_sort_caches; this is a plain dict lookup.
     """
-    st = MOVIE_STATS.get(movie_name, {"avg": 0.0, "count": 0})
-    movie_id = MOVIES_BY_NAME.get(movie_name, {}).get("movie_id", 10**12)
-    # negative for descending on avg and count
-    return (-st["avg"], -st["count"], movie_name.lower(), movie_id)
+    return _MOVIE_SORT_KEY[movie_name]
 
 
 def _genre_sort_key(norm_genre: str) -> Tuple[float, int, str]:
@@ -500,6 +789,9 @@ def _genre_sort_key(norm_genre: str) -> Tuple[float, int, str]:
       2) total_ratings desc
       3) genre name A-Z (display/original case)
     """
+    key = _GENRE_SORT_KEY.get(norm_genre)
+    if key is not None:
+        return key
     st = GENRE_STATS.get(norm_genre, {"avg_of_movie_avgs": 0.0, "total_ratings": 0})
     display = GENRE_ORIGINAL_CASE.get(norm_genre, norm_genre)
     return (-st["avg_of_movie_avgs"], -st["total_ratings"], display.lower())
@@ -514,14 +806,12 @@ def feature_movie_popularity() -> None:
     List all movies by popularity (avg desc, then count desc, then A-Z, then ID asc).
     """
     print("\n=== Movie Popularity (All) ===")
-    all_movies = sorted(MOVIES_BY_NAME.keys(), key=_movie_sort_key)
+    all_movies = _MOVIES_SORTED_GLOBAL
     if not all_movies:
         print("No movies found.")
     else:
         for idx, name in enumerate(all_movies, start=1):
-            m = MOVIES_BY_NAME[name]
-            st = MOVIE_STATS.get(name, {"avg": 0.0, "count": 0})
-            print(f"{idx}) {m['name']} — Avg: {_fmt_avg(st['avg'])} (Count: {st['count']}) — Genre: {m['genre_original']}")
+            print(f"{idx}) {_MOVIE_LINE_FULL[name]}")
     print()
     _back_or_quit()
 
@@ -536,34 +826,29 @@ def feature_movie_popularity_in_genre() -> None:
         _back_or_quit()
         return
 
-    # Build display list of genres in original case, sorted A-Z
-    genres_display = sorted({GENRE_ORIGINAL_CASE.get(g, g) for g in GENRES.keys()}, key=lambda s: s.lower())
+    # Genre display list (original case, sorted A-Z) is cached at load time
+    genres_display = _GENRES_DISPLAY_SORTED
 
     while True:
         print("Available genres:")
         for i, g in enumerate(genres_display, start=1):
             print(f"{i}) {g}")
-        choice = input("\nSelect a genre by number, or 'b' to go back, or 'q' to quit: ").strip()
-        if choice.lower() == "q":
-            sys.exit(0)
-        if choice.lower() == "b":
+        idx = _read_choice("\nSelect a genre by number, or 'b' to go back, or 'q' to quit: ")
+        if idx is _BACK:
             return
-        idx = _strip_int_like(choice)
         if idx is None or not (1 <= idx <= len(genres_display)):
             print("Invalid selection. Please choose a listed number, or 'b'/'q'.\n")
             continue
 
         chosen_display = genres_display[idx - 1]
         norm = _norm_genre(chosen_display)
-        movies_in_g = sorted(GENRES.get(norm, set()), key=_movie_sort_key)
+        movies_in_g = _MOVIES_SORTED_BY_GENRE.get(norm, [])
         print(f"\n--- {chosen_display} ---")
         if not movies_in_g:
             print("No movies in this genre.")
         else:
             for j, name in enumerate(movies_in_g, start=1):
-                m = MOVIES_BY_NAME[name]
-                st = MOVIE_STATS.get(name, {"avg": 0.0, "count": 0})
-                print(f"{j}) {m['name']} — Avg: {_fmt_avg(st['avg'])} (Count: {st['count']})")
+                print(f"{j}) {_MOVIE_LINE_BRIEF[name]}")
         print()
         _back_or_quit()
         return
@@ -581,9 +866,7 @@ def feature_genre_popularity() -> None:
 
     ranked = sorted(GENRE_STATS.keys(), key=_genre_sort_key)
     for i, g in enumerate(ranked, start=1):
-        st = GENRE_STATS[g]
-        disp = GENRE_ORIGINAL_CASE.get(g, g)
-        print(f"{i}) {disp} — Avg of avgs: {_fmt_avg(st['avg_of_movie_avgs'])} (Total ratings: {st['total_ratings']})")
+        print(f"{i}) {_GENRE_LINE[g]}")
     print()
     _back_or_quit()
 
@@ -601,13 +884,10 @@ def feature_user_preference_for_genre() -> None:
     _print_user_list()
 
     while True:
-        s = input("\nEnter a user ID (value, not index), or 'b' to go back, or 'q' to quit: ").strip()
-        if s.lower() == "q":
-            sys.exit(0)
-        if s.lower() == "b":
+        uid = _read_choice("\nEnter a user ID (value, not index), or 'b' to go back, or 'q' to quit: ")
+        if uid is _BACK:
             return
-        uid = _strip_int_like(s)
-        if uid is None or uid not in RATINGS_BY_USER:
+        if uid is None or uid not in _USER_INDEX:
             print("Invalid user ID. Please choose an ID from the list, or 'b'/'q'.")
             continue
 
@@ -641,13 +921,10 @@ def feature_recommend_movies() -> None:
     _print_user_list()
 
     while True:
-        s = input("\nEnter a user ID (value, not index), or 'b' to go back, or 'q' to quit: ").strip()
-        if s.lower() == "q":
-            sys.exit(0)
-        if s.lower() == "b":
+        uid = _read_choice("\nEnter a user ID (value, not index), or 'b' to go back, or 'q' to quit: ")
+        if uid is _BACK:
             return
-        uid = _strip_int_like(s)
-        if uid is None or uid not in RATINGS_BY_USER:
+        if uid is None or uid not in _USER_INDEX:
             print("Invalid user ID. Please choose an ID from the list, or 'b'/'q'.")
             continue
 
@@ -666,20 +943,28 @@ def feature_recommend_movies() -> None:
         disp = GENRE_ORIGINAL_CASE.get(norm_g, norm_g)
         print(f"\nPreferred Genre for User {uid}: {disp} — Avg: {_fmt_avg(avg)} (Count: {cnt})")
 
-        rated = set(RATINGS_BY_USER.get(uid, {}).keys())
-        candidates = sorted(GENRES.get(norm_g, set()), key=_movie_sort_key)
+        rated_arr = _USER_RATED_IDX.get(uid)
+        cand_idx = _GENRE_MOVIE_IDX_SORTED.get(norm_g)
 
-        unseen: List[str] = [m for m in candidates if m not in rated]
-        if not unseen:
+        # Candidates are already popularity-sorted; mark the user's rated
+        # movies in a dense boolean mask and take the first 3 unseen indices —
+        # integer array indexing instead of per-candidate hashing.
+        if cand_idx is None:
+            recs: List[str] = []
+        elif rated_arr is None or not rated_arr.size:
+            recs = [_MOVIE_NAMES[i] for i in cand_idx[:3]]
+        else:
+            seen = np.zeros(len(_MOVIE_NAMES), dtype=bool)
+            seen[rated_arr] = True
+            recs = [_MOVIE_NAMES[i] for i in cand_idx[~seen[cand_idx]][:3]]
+        if not recs:
             print("No unseen movies to recommend in this genre.\n")
             _back_or_quit()
             return
 
-        recs = unseen[:3]
         print("\nTop Recommendations:")
         for i, name in enumerate(recs, start=1):
-            st = MOVIE_STATS.get(name, {"avg": 0.0, "count": 0})
-            print(f"{i}) {name} — Avg: {_fmt_avg(st['avg'])} (Count: {st['count']})")
+            print(f"{i}) {_MOVIE_LINE_BRIEF[name]}")
         print()
         _back_or_quit()
         return
@@ -715,24 +1000,25 @@ def _compute_user_top_genre_for(uid: int) -> None:
     """
     Compute and place the top genre for a single user into USER_TOP_GENRE.
     """
-    rated_map = RATINGS_BY_USER.get(uid, {})
+    target = _USER_INDEX.get(uid)
+    if target is None:
+        return
     agg: Dict[str, Tuple[float, int]] = {}
-    for movie_name, r in rated_map.items():
-        movie = MOVIES_BY_NAME.get(movie_name)
-        if not movie:
+    for u, mi, r in zip(_RATING_USER_IDX, _RATING_MOVIE_IDX, _RATING_VALUES):
+        if u != target:
             continue
-        gn = movie["genre_norm"]
+        gn = MOVIES_BY_NAME[_MOVIE_NAMES[mi]].genre_norm
         s, c = agg.get(gn, (0.0, 0))
         agg[gn] = (s + r, c + 1)
     if not agg:
         return
-    best = sorted(
-        ((gn, s / c, c) for gn, (s, c) in agg.items() if c >= 1),
-        key=lambda tup: (-tup[1], -tup[2], GENRE_ORIGINAL_CASE.get(tup[0], tup[0]).lower()),
+    # Single linear min pass (avg desc, count desc, genre name A-Z) instead of
+    # sorting all genres just to take the first element.
+    gn, (s, c) = min(
+        agg.items(),
+        key=lambda kv: (-kv[1][0] / kv[1][1], -kv[1][1], _GENRE_TIEBREAK.get(kv[0], kv[0])),
     )
-    if best:
-        top = best[0]
-        USER_TOP_GENRE[uid] = (top[0], top[1], top[2])
+    USER_TOP_GENRE[uid] = (gn, s / c, c)
 
 
 def _print_user_list() -> None:
@@ -742,15 +1028,9 @@ def _print_user_list() -> None:
     if not USER_IDS:
         print("No users available.")
         return
-    print("Available user IDs:")
-    line = []
-    for i, uid in enumerate(USER_IDS, start=1):
-        line.append(str(uid))
-        if len(line) == 12:
-            print("  " + ", ".join(line))
-            line = []
-    if line:
-        print("  " + ", ".join(line))
+    ids = [str(uid) for uid in USER_IDS]
+    rows = ["  " + ", ".join(ids[i:i + 12]) for i in range(0, len(ids), 12)]
+    sys.stdout.write("Available user IDs:\n" + "\n".join(rows) + "\n")
 
 
 def _back_or_quit() -> None:
@@ -758,10 +1038,7 @@ def _back_or_quit() -> None:
     Wait for user to press 'b' to go back or 'q' to quit.
     """
     while True:
-        s = input("Press 'b' to go back or 'q' to quit: ").strip().lower()
-        if s == "q":
-            sys.exit(0)
-        if s == "b":
+        if _read_choice("Press 'b' to go back or 'q' to quit: ") is _BACK:
             return
         print("Invalid input. Please press 'b' or 'q'.")
 
@@ -770,26 +1047,28 @@ def _back_or_quit() -> None:
 # Main Menu
 # =========================
 
+_MENU_TEXT = (
+    "=== Main Menu ===\n"
+    "1) Movie popularity (Top N overall)\n"
+    "2) Movie popularity in a genre\n"
+    "3) Genre popularity (Top N)\n"
+    "4) User preference for genre\n"
+    "5) Recommend movies\n"
+    "6) Reload data\n"
+    "7) Quit\n"
+)
+
+
 def main_menu() -> None:
     """
     Display the main menu and route to chosen features.
     """
     while True:
-        print("=== Main Menu ===")
-        print("1) Movie popularity (Top N overall)")
-        print("2) Movie popularity in a genre")
-        print("3) Genre popularity (Top N)")
-        print("4) User preference for genre")
-        print("5) Recommend movies")
-        print("6) Reload data")
-        print("7) Quit")
-
-        choice = input("Choose an option (1-7), or 'q' to quit: ").strip()
-        if choice.lower() == "q":
-            sys.exit(0)
+        # one write per redraw instead of a print call per line
+        sys.stdout.write(_MENU_TEXT)
 
-        num = _strip_int_like(choice)
-        if num is None or not (1 <= num <= 7):
+        num = _read_choice("Choose an option (1-7), or 'q' to quit: ", allow_back=False)
+        if not isinstance(num, int) or not (1 <= num <= 7):
             print("Invalid choice. Please select 1-7 (or 'q' to quit).\n")
             continue
 